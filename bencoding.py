@@ -1,5 +1,4 @@
-from typing import Any
-from string import digits
+from typing import Any, Callable, Optional
 
 TOKEN_INT: int = ord("i")
 TOKEN_LIST: int = ord("l")
@@ -7,116 +6,166 @@ TOKEN_DICT: int = ord("d")
 TOKEN_STR_SPLIT: int = ord(":")
 TOKEN_END: int = ord("e")
 
-def decode(encoded: bytes) -> int | bytes | list[Any] | dict[bytes, Any]:
-    """Decode bencoded data"""
-
-    def decodeNext(index: int) -> tuple[int | bytes | list[Any] | dict[bytes, Any], int]:
-        if encoded[index] == TOKEN_INT:
-            return decodeInt(index)
-        elif encoded[index] == TOKEN_LIST:
-            return decodeList(index)
-        elif encoded[index] == TOKEN_DICT:
-            return decodeDict(index)
+# Strings at least this long are returned from decode as memoryviews rather than copied
+VIEW_THRESHOLD: int = 4096
+
+def decode(
+    encoded: bytes,
+    spans: Optional[dict[bytes, tuple[int, int]]] = None
+) -> int | bytes | memoryview | list[Any] | dict[bytes, Any]:
+    """Decode bencoded data
+
+    String values of at least VIEW_THRESHOLD bytes are returned as memoryview slices of
+    `encoded` to avoid copying them; other strings and all dictionary keys are bytes.
+
+    If `spans` is given and the data is a dictionary, it is filled with the (start, end)
+    byte offsets of each top-level value in `encoded`.
+    """
+
+    pos = 0
+    size = len(encoded)
+    find = encoded.index
+    view = memoryview(encoded)
+    # Each entry is [container, pending dict key]; lists never have a pending key
+    stack: list[list[Any]] = []
+
+    while True:
+        if pos >= size:
+            raise ValueError(f"Missing end token {TOKEN_END}")
+
+        token = encoded[pos]
+
+        if spans is not None and len(stack) == 1 and stack[0][1] is not None:
+            value_start = pos
+
+        # Strings are the most common token, so they are dispatched first
+        if 0x30 <= token <= 0x39:
+            try:
+                end = find(TOKEN_STR_SPLIT, pos)
+            except ValueError:
+                raise ValueError(f"No end token ({TOKEN_STR_SPLIT}) found") from None
+
+            length = int(encoded[pos:end])
+            start = end + 1
+            pos = start + length
+
+            if length >= VIEW_THRESHOLD and not (stack and stack[-1][1] is None and type(stack[-1][0]) is dict):
+                value = view[start:pos]
+            else:
+                value = encoded[start:pos]
+        elif token == TOKEN_LIST:
+            stack.append([[], None])
+            pos += 1
+            continue
+        elif token == TOKEN_DICT:
+            stack.append([{}, None])
+            pos += 1
+            continue
+        elif token == TOKEN_END:
+            if not stack:
+                raise ValueError(f"Unexpected end token at {pos}")
+
+            value, key = stack.pop()
+
+            if key is not None:
+                raise ValueError(f"Missing value for key {key!r} at index {pos}")
+
+            pos += 1
+        elif token == TOKEN_INT:
+            try:
+                end = find(TOKEN_END, pos)
+            except ValueError:
+                raise ValueError(f"No end token ({TOKEN_END}) found") from None
+
+            first = encoded[pos + 1]
+            length = end - pos - 1
+
+            if first == 0x30 and length > 1:
+                raise ValueError(f"Leading zero in number {encoded[pos + 1:end]!r}")
+
+            if first == 0x2D and length == 2 and encoded[pos + 2] == 0x30:
+                raise ValueError("Negative zero not valid bencode")
+
+            value = int(encoded[pos + 1:end])
+            pos = end + 1
         else:
-            return decodeStr(index)
-
-    def decodeInt(index: int) -> tuple[int, int]:
-        if encoded[index] != TOKEN_INT:
-            raise Exception(f"Wrong token at {index}, expected {TOKEN_INT}, found {encoded[index]}")
-        end: int = 0
-
-        for i in range(index, len(encoded)):
-            if encoded[i] == TOKEN_END:
-                end = i
-                break
-
-        if end == 0:
-            raise ValueError(f"No end token ({TOKEN_END}) found")
-
-        number = encoded[index + 1:end]
-
-        if number.startswith(b"0") and len(number) > 1:
-            raise ValueError(f"Leading zero in number {number.decode()}")
+            raise ValueError(f"Attempting to parse as a string but no digits at index {pos}")
 
-        if number == b"-0":
-            raise ValueError("Negative zero not valid bencode")
+        if not stack:
+            break
 
-        out = int(number)
+        top = stack[-1]
 
-        return out, end + 1
-    
-    def decodeStr(index: int) -> tuple[bytes, int]:
-        if chr(encoded[index]) not in digits:
-            raise ValueError(f"Attempting to parse as a string but no digits at index {index}")
+        if type(top[0]) is list:
+            top[0].append(value)
+        elif top[1] is None:
+            if type(value) is not bytes:
+                raise ValueError(f"Dictionary key must be a string, found {type(value).__name__}")
 
-        end = 0
-
-        for i in range(index, len(encoded)):
-            if encoded[i] == TOKEN_STR_SPLIT:
-                end = i
-                break
-
-        if end == 0:
-            raise ValueError(f"No end token ({TOKEN_STR_SPLIT}) found")  
-
-        length = int(encoded[index:end].decode())
-
-        string = encoded[end + 1:end + length + 1]
+            top[1] = value
+        else:
+            top[0][top[1]] = value
 
-        return string, end + length + 1
+            if spans is not None and len(stack) == 1:
+                spans[top[1]] = (value_start, pos)
 
-    def decodeList(index: int) -> tuple[list[Any], int]:
-        if encoded[index] != TOKEN_LIST:
-            raise ValueError(f"Wrong token at {index}, expected {TOKEN_LIST}, found {encoded[index]}")
+            top[1] = None
 
-        output: list[Any] = []
-        current_index = index + 1
+    if pos != size:
+        raise ValueError("Trailing data after valid bencode")
 
-        while encoded[current_index] != TOKEN_END:
-            to_add, current_index = decodeNext(current_index)
-            output.append(to_add)
+    return value
 
-            if current_index >= len(encoded):
-                raise ValueError(f"Missing end token {TOKEN_END}")
+def encode(original: int | bytes | memoryview | list[Any] | dict[bytes, Any]) -> bytes:
+    """Encode data into bencode"""
 
-        return output, current_index + 1
+    buf = bytearray()
+    encode_to(buf.extend, original)
 
-    def decodeDict(index: int) -> tuple[dict[bytes, Any], int]:
-        output: dict[bytes, Any] = {}
-        current_index = index + 1
+    return bytes(buf)
 
-        while encoded[current_index] != TOKEN_END:
-            key, current_index = decodeStr(current_index)
-            value, current_index = decodeNext(current_index)
+def encode_to(
+    write: Callable[[bytes | memoryview], Any],
+    original: int | bytes | memoryview | list[Any] | dict[bytes, Any]
+) -> None:
+    """Encode data into bencode, passing each chunk to write instead of building one bytes object"""
 
-            if current_index >= len(encoded):
-                raise ValueError(f"Missing end token {TOKEN_END}")
+    if isinstance(original, bytes):
+        write(b"%d:" % len(original))
+        write(original)
+    elif isinstance(original, memoryview):
+        # len() counts items, so view the buffer as single bytes before measuring it
+        original = original.cast("B")
+        write(b"%d:" % len(original))
+        write(original)
+    elif isinstance(original, int):
+        write(b"i%de" % original)
+    elif isinstance(original, list):
+        write(b"l")
 
-            output[key] = value
+        for obj in original:
+            encode_to(write, obj)
 
-        return output, current_index + 1
+        write(b"e")
+    elif isinstance(original, dict):
+        write(b"d")
 
-    result, final = decodeNext(0)
+        # Decoded dictionaries already have sorted keys, so only sort once one is out of order
+        items = original.items()
+        previous = None
 
-    if final != len(encoded):
-        raise ValueError("Trailing data after valid bencode")
+        for key in original:
+            if previous is not None and key < previous:
+                items = sorted(items)
+                break
 
-    return result
+            previous = key
 
-def encode(original: int | bytes | list[Any] | dict[bytes, Any]) -> bytes:
-    """Encode data into bencode"""
+        for key, value in items:
+            encode_to(write, key)
+            encode_to(write, value)
 
-    if isinstance(original, bytes):
-        return str(len(original)).encode() + bytes([TOKEN_STR_SPLIT]) + original
-    elif isinstance(original, int):
-        return bytes([TOKEN_INT]) + str(original).encode() + bytes([TOKEN_END])
-    elif isinstance(original, list):
-        return bytes([TOKEN_LIST]) + b''.join(encode(obj) for obj in original) + bytes([TOKEN_END])
-    elif isinstance(original, dict):
-        return \
-            bytes([TOKEN_DICT]) + \
-            b''.join(encode(key) + encode(value) for key, value in sorted(original.items(), key=lambda x: x[0])) + \
-            bytes([TOKEN_END])
+        write(b"e")
     else:
         raise TypeError("Wrong input type")
 
@@ -0,0 +1,106 @@
+import unittest
+import bencoding
+
+class TestDecode(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        cases = [
+            b"i0e",
+            b"i-42e",
+            b"0:",
+            b"4:spam",
+            b"le",
+            b"de",
+            b"li1e4:spamli2eee",
+            b"d3:bar4:spam3:fooi42e4:listl3:one3:two5:threeee",
+            b"d1:ad1:bd1:cleee1:d0:e",
+        ]
+
+        for encoded in cases:
+            with self.subTest(encoded=encoded):
+                self.assertEqual(bencoding.encode(bencoding.decode(encoded)), encoded)
+
+    def test_decoded_values(self) -> None:
+        self.assertEqual(
+            bencoding.decode(b"d3:bar4:spam3:fooi42e4:listl3:one3:two5:threeee"),
+            {b"bar": b"spam", b"foo": 42, b"list": [b"one", b"two", b"three"]}
+        )
+
+    def test_malformed(self) -> None:
+        cases = [
+            b"",
+            b"i03e",        # leading zero
+            b"i00e",
+            b"i-0e",        # negative zero
+            b"i12",         # missing integer end
+            b"ie",
+            b"3abc",        # missing string split
+            b"4:ab",        # string shorter than its length
+            b"li1e",        # missing list end
+            b"d3:fooi1e",   # missing dict end
+            b"d3:fooe",     # key without value
+            b"di1ei2ee",    # non-string keys
+            b"dli1eei2ee",
+            b"i1ei2e",      # trailing data
+            b"4:spam4:eggs",
+            b"e",
+            b"x",
+        ]
+
+        for encoded in cases:
+            with self.subTest(encoded=encoded):
+                with self.assertRaises(ValueError):
+                    bencoding.decode(encoded)
+
+    def test_spans(self) -> None:
+        encoded = b"d1:ai1e1:bli2ee1:cd1:x1:yee"
+        spans: dict[bytes, tuple[int, int]] = {}
+        bencoding.decode(encoded, spans)
+
+        self.assertEqual(spans, {b"a": (4, 7), b"b": (10, 15), b"c": (18, 26)})
+        self.assertEqual(encoded[slice(*spans[b"c"])], b"d1:x1:ye")
+
+    def test_spans_not_dict(self) -> None:
+        spans: dict[bytes, tuple[int, int]] = {}
+        bencoding.decode(b"li1ee", spans)
+
+        self.assertEqual(spans, {})
+
+    def test_view_threshold(self) -> None:
+        short = b"x" * (bencoding.VIEW_THRESHOLD - 1)
+        long = b"y" * bencoding.VIEW_THRESHOLD
+
+        decoded = bencoding.decode(bencoding.encode([short, long]))
+        self.assertIsInstance(decoded, list)
+        self.assertIs(type(decoded[0]), bytes)
+        self.assertIs(type(decoded[1]), memoryview)
+        self.assertEqual(decoded[1], long)
+
+        # Dictionary keys stay bytes however long they are
+        decoded = bencoding.decode(bencoding.encode({long: 1}))
+        self.assertIsInstance(decoded, dict)
+        self.assertEqual([type(key) for key in decoded], [bytes])
+
+class TestEncode(unittest.TestCase):
+    def test_sorts_keys(self) -> None:
+        self.assertEqual(bencoding.encode({b"b": 1, b"a": 2}), b"d1:ai2e1:bi1ee")
+
+    def test_sorts_keys_out_of_order_after_sorted_prefix(self) -> None:
+        self.assertEqual(bencoding.encode({b"a": 1, b"c": 2, b"b": 3}), b"d1:ai1e1:bi3e1:ci2ee")
+
+    def test_memoryview_length_in_bytes(self) -> None:
+        view = memoryview(b"\x01\x00\x02\x00").cast("H")
+
+        self.assertEqual(bencoding.encode(view), b"4:\x01\x00\x02\x00")
+
+    def test_encode_to_chunks(self) -> None:
+        original = {b"list": [1, b"two"], b"name": b"x"}
+        chunks: list[bytes] = []
+        bencoding.encode_to(chunks.append, original)
+
+        self.assertEqual(b"".join(chunks), bencoding.encode(original))
+    def test_wrong_type(self) -> None:
+        with self.assertRaises(TypeError):
+            bencoding.encode("string")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import hashlib
+import bencoding
+import torrent_parser
+
+class TestTorrentFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.torrent")
+        torrent_parser._file_cache.clear()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, raw: bytes) -> None:
+        with open(self.path, "wb") as f:
+            f.write(raw)
+
+    def load(self) -> torrent_parser.TorrentFile:
+        torrent = torrent_parser.TorrentFile(self.path)
+        torrent.load()
+
+        return torrent
+
+    def test_load(self) -> None:
+        info = {b"length": 3, b"name": b"file", b"piece length": 16384, b"pieces": b"p" * 20}
+        self.write(bencoding.encode({b"announce": b"http://tracker/announce", b"info": info}))
+        torrent = self.load()
+
+        self.assertEqual(torrent.get_announce_url(), b"http://tracker/announce")
+        self.assertEqual(torrent.get_file_info()["name"], b"file")
+        self.assertEqual(torrent.info_hash, hashlib.sha1(bencoding.encode(info)).digest())
+
+    def test_integer_announce_returned_unchanged(self) -> None:
+        self.write(b"d8:announcei100000000e4:infod4:name1:xee")
+
+        self.assertEqual(self.load().get_announce_url(), 100000000)
+
+    def test_info_hash_from_raw_bytes(self) -> None:
+        # The info dictionary's keys are not sorted, so re-encoding it changes its bytes
+        raw = b"d4:infod4:namei1e1:ai2eee"
+        self.write(raw)
+        torrent = self.load()
+
+        spans: dict[bytes, tuple[int, int]] = {}
+        bencoding.decode(raw, spans)
+        start, end = spans[b"info"]
+        self.assertEqual(torrent.info_hash, hashlib.sha1(raw[start:end]).digest())
+
+        torrent.compute_info_hash()
+        self.assertEqual(torrent.info_hash, hashlib.sha1(bencoding.encode(torrent.info)).digest())
+        self.assertNotEqual(torrent.info_hash, hashlib.sha1(raw[start:end]).digest())
+
+    def test_compute_info_hash_uses_changed_info(self) -> None:
+        self.write(b"d4:infod4:name1:xee")
+        torrent = self.load()
+        assert torrent.info is not None
+        torrent.info[b"name"] = b"changed"
+        torrent.compute_info_hash()
+
+        self.assertEqual(torrent.info_hash, hashlib.sha1(b"d4:name7:changede").digest())
+
+    def test_loads_do_not_share_data(self) -> None:
+        self.write(b"d8:announce3:url4:infod4:name1:xee")
+        first = self.load()
+        assert first.data is not None and first.info is not None
+        first.data[b"announce"] = b"MUTATED"
+        first.info[b"name"] = b"changed"
+        second = self.load()
+
+        self.assertEqual(second.get_announce_url(), b"url")
+        self.assertEqual(second.info, {b"name": b"x"})
+
+    def test_reload_after_rewrite(self) -> None:
+        self.write(b"d4:infod4:name1:xee")
+        self.load()
+
+        # Different size
+        self.write(b"d4:infod4:name2:yyee")
+        self.assertEqual(self.load().info, {b"name": b"yy"})
+
+        # Same size, newer mtime
+        self.write(b"d4:infod4:name2:zzee")
+        mtime = os.stat(self.path).st_mtime_ns + 10 ** 9
+        os.utime(self.path, ns=(mtime, mtime))
+        self.assertEqual(self.load().info, {b"name": b"zz"})
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "needs named pipes")
+    def test_load_from_pipe_is_not_cached(self) -> None:
+        raw = b"d8:announce3:url4:infod4:name1:xee"
+        os.mkfifo(self.path)
+
+        def write_pipe() -> None:
+            with open(self.path, "wb") as f:
+                f.write(raw)
+
+        for _ in range(2):
+            writer = threading.Thread(target=write_pipe)
+            writer.start()
+            torrent = self.load()
+            writer.join()
+
+            self.assertEqual(torrent.get_announce_url(), b"url")
+            self.assertEqual(len(torrent_parser._file_cache), 0)
+
+    def test_short_reads(self) -> None:
+        raw = b"d8:announce3:url4:infod4:name1:xee"
+        self.write(raw)
+        read = os.read
+
+        with mock.patch.object(torrent_parser.os, "read", lambda fd, size: read(fd, min(size, 5))):
+            torrent = self.load()
+
+        self.assertEqual(torrent.get_announce_url(), b"url")
+        self.assertEqual(torrent.info_hash, hashlib.sha1(b"d4:name1:xe").digest())
+
+if __name__ == "__main__":
+    unittest.main()
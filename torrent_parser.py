@@ -1,6 +1,81 @@
 from typing import Optional, Any
+from collections import OrderedDict
 import bencoding
 import hashlib
+import os
+import stat
+
+# Number of decoded .torrent files kept in memory by _load_and_decode
+FILE_CACHE_SIZE: int = 64
+
+# (data, raw, spans) keyed on (absolute path, mtime, size), least recently used first
+_file_cache: OrderedDict[tuple[str, int, int], tuple[Any, bytes, dict[bytes, tuple[int, int]]]] = OrderedDict()
+
+def _sha1(data: bytes | memoryview = b"") -> Any:
+    """Return a SHA1 hash object for info hashes."""
+    # The info hash is a protocol identifier, not a security measure, so FIPS policy need not block it
+    return hashlib.sha1(data, usedforsecurity=False)
+
+def _read_all(fd: int, size: int) -> bytes:
+    """Read from fd until EOF, starting with a read of the expected size."""
+    chunks = []
+
+    while True:
+        chunk = os.read(fd, max(size, 65536))
+
+        if not chunk:
+            break
+
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
+def _load_and_decode(path: str) -> tuple[Any, bytes, dict[bytes, tuple[int, int]]]:
+    """Read and decode a .torrent file, returning (data, raw, top-level spans).
+
+    Regular files are cached on (absolute path, mtime, size) taken from the open file, so an
+    edited file is read again; anything else, such as a pipe, is always read.
+    The data is shared between callers, so it must be copied with _copy_decoded before use.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        file_stat = os.fstat(fd)
+        key = None
+
+        if stat.S_ISREG(file_stat.st_mode):
+            key = (os.path.abspath(path), file_stat.st_mtime_ns, file_stat.st_size)
+
+            if key in _file_cache:
+                _file_cache.move_to_end(key)
+                return _file_cache[key]
+
+        raw = _read_all(fd, file_stat.st_size)
+    finally:
+        os.close(fd)
+
+    spans: dict[bytes, tuple[int, int]] = {}
+    data = bencoding.decode(raw, spans)
+
+    if key is not None:
+        _file_cache[key] = (data, raw, spans)
+
+        if len(_file_cache) > FILE_CACHE_SIZE:
+            _file_cache.popitem(last=False)
+
+    return data, raw, spans
+
+def _copy_decoded(value: Any) -> Any:
+    """Copy the lists and dicts of decoded data; strings and integers are immutable and shared."""
+    if type(value) is dict:
+        return {key: _copy_decoded(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_copy_decoded(item) for item in value]
+
+    return value
+
+def _as_bytes(value: Any) -> Any:
+    """Copy a decoded memoryview to bytes, leaving any other value unchanged."""
+    return value.tobytes() if isinstance(value, memoryview) else value
 
 class TorrentFile:
     path: str
@@ -16,8 +91,10 @@ class TorrentFile:
 
     def load(self) -> None:
         """Load and decode the .torrent file."""
-        with open(self.path, "rb") as f:
-            data = bencoding.decode(f.read())
+        data, raw, spans = _load_and_decode(self.path)
+
+        # Copy the cached data so changes to this instance do not leak into other loads
+        data = _copy_decoded(data)
 
         if not isinstance(data, dict):
             raise TypeError(".torrent file is not a dictionary")
@@ -30,18 +107,26 @@ class TorrentFile:
             raise TypeError("info not a dictionary")
 
         self.info = self.data[b"info"]
-        self.compute_info_hash()
 
+        # Hash the info bytes exactly as they appear in the file rather than re-encoding them
+        start, end = spans[b"info"]
+        self.info_hash = _sha1(memoryview(raw)[start:end]).digest()
 
     def compute_info_hash(self) -> None:
-        """Compute SHA1 hash of bencoded 'info' dictionary."""
+        """Compute SHA1 hash of bencoded 'info' dictionary.
+
+        This hashes the canonical re-encoding of self.info, so it picks up any changes to it.
+        For a file whose info dictionary is not canonically encoded (e.g. unsorted keys) the
+        result differs from the hash load() sets from the raw file bytes.
+        """
 
         if not isinstance(self.info, dict):
             raise TypeError("info not a dictionary")
 
-        encoded = bencoding.encode(self.info)
+        info_hash = _sha1()
+        bencoding.encode_to(info_hash.update, self.info)
 
-        self.info_hash = hashlib.sha1(encoded).digest()
+        self.info_hash = info_hash.digest()
 
     def get_announce_url(self) -> Optional[bytes]:
         """Return the tracker URL from the torrent."""
@@ -49,12 +134,12 @@ class TorrentFile:
             raise TypeError("info not a dictionary")
 
         if b"announce" in self.data:
-            return self.data[b"announce"]
+            return _as_bytes(self.data[b"announce"])
         
         raise ValueError("No announce URL in self.data")
 
     def get_file_info(self) -> dict[str, Any]:
-        """Return basic file info."""
+        """Return basic file info. 'pieces' may be a memoryview into the raw file."""
         if not isinstance(self.info, dict):
             raise TypeError("self.info not a dictionary")
 
@@ -62,7 +147,7 @@ class TorrentFile:
             raise ValueError("Not all required keys in info dictionary")
 
         return {
-            "name": self.info[b"name"],
+            "name": _as_bytes(self.info[b"name"]),
             "length": self.info[b"length"],
             "piece length": self.info[b"piece length"],
             "pieces": self.info[b"pieces"]